@@ -0,0 +1,11 @@
+# -*- coding: utf-8 -*-
+"""
+pytest configuration.
+
+The test scripts also run standalone (python test_modules.py). Under pytest,
+each test file is independent, so the suite can be spread over workers with
+pytest-xdist: pytest -n auto
+"""
+
+# Interactive Tk window, needs a display and a user
+collect_ignore = ["test_combobox.py"]
@@ -0,0 +1,29 @@
+# -*- coding: utf-8 -*-
+"""
+json_utils.py
+
+JSON encoding/decoding shared by the GUI and the tests.
+Uses orjson when it is installed, the standard library otherwise.
+"""
+import json
+
+try:
+    import orjson  # optional, faster JSON encoding/decoding
+except ImportError:
+    orjson = None
+
+
+def dumps(obj, indent=False):
+    """Encode obj to JSON bytes (compact, or indented by 2 spaces)"""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else 0)
+    if indent:
+        return json.dumps(obj, indent=2).encode('utf-8')
+    return json.dumps(obj, separators=(',', ':')).encode('utf-8')
+
+
+def loads(data):
+    """Decode JSON from bytes or str"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
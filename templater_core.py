@@ -5,12 +5,34 @@ templater_core.py
 Core functionality for CSV to DOCX template generation.
 Extracted from attestation.py to be reusable by both CLI and GUI.
 """
+import codecs
+import copy
+import csv
+import io
+import multiprocessing
 import os
 import re
 import sys
 import zipfile
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import ExitStack
+from functools import lru_cache
+from itertools import repeat
 import pandas as pd
 from docx import Document
+from docx.oxml.ns import qn
+# Internal python-docx helper (tested with python-docx 1.2.0, pinned < 2 in requirements.txt):
+# serializes a part exactly as Document.save() does
+from docx.opc.oxml import serialize_part_xml
+from docx.text.paragraph import Paragraph
+from docx.text.run import Run
+from xml.sax.saxutils import escape as xml_escape
+
+try:
+    import re2  # Optional (google-re2): linear-time engine for the placeholder alternations
+except ImportError:
+    re2 = None
 
 # Encodage sûr pour Windows / Mac
 DEFAULT_FS_ENCODING = sys.getfilesystemencoding() or "utf-8"
@@ -19,61 +41,246 @@ DEFAULT_FS_ENCODING = sys.getfilesystemencoding() or "utf-8"
 ORG_KEYWORDS = (
     "SA", "SÀRL", "SARL", "Sarl", "Association", "Fondation", "Société", "GmbH", "AG", "Ltd", "Inc"
 )
+# Tous les mots-clés en une seule passe regex (sensible à la casse, comme avant)
+_ORG_RE = re.compile("|".join(map(re.escape, ORG_KEYWORDS)))
 FEMALE_HINTS = (
     "anne", "anna", "elle", "ette", "ine", "ene", "ène",
     "a", "ia", "ya", "na", "ina", "liane", "iane", "line", "rine",
     "otte", "ille", "ise", "yse", "cie", "lie", "rie", "nie", "xie",
     "zia", "cia", "tia", "ria", "aude", "onde", "hilde", "rude", "ude", "iette"
 )
-FEMALE_NAMES = {
+FEMALE_NAMES = frozenset({
     "virginia","gudrun","marianne","cécile","catherine","lise","nicole","sylvie",
     "eliane","blandine","monique","geneviève","laurence","liliane","ursula","herta",
     "paulette","françoise","elisabeth","elisa","christiane","cynthia","efinizia",
     "jacqueline","annemarie","myriam","liliana","anne","ramona","béatrice",
     "vivianne","thérèse","heidi","edith","monika","julia","iris","hélène","pauline",
     "marie","paola","beatrice","francoise","therese","monica","isabelle"
+})
+
+# BOM -> encodage (UTF-32 avant UTF-16 : BOM_UTF32_LE commence par BOM_UTF16_LE)
+_BOM_ENCODINGS = (
+    (codecs.BOM_UTF32_LE, "utf-32"),
+    (codecs.BOM_UTF32_BE, "utf-32"),
+    (codecs.BOM_UTF8, "utf-8-sig"),
+    (codecs.BOM_UTF16_LE, "utf-16"),
+    (codecs.BOM_UTF16_BE, "utf-16"),
+)
+
+# Éléments WordprocessingML manipulés directement via lxml
+_W_T = qn("w:t")
+_W_P = qn("w:p")
+# <w:t> des runs du paragraphe lui-même, sans ceux des zones de texte qu'il ancre
+_P_RUN_TEXT = f"./{qn('w:r')}/{_W_T}"
+# Contenu de run qui n'est pas du texte (images, formes, zones de texte) : jamais effacé par _merge_runs
+_RUN_OBJECT_TAGS = frozenset((
+    qn("w:drawing"), qn("w:pict"), qn("w:object"),
+    "{http://schemas.openxmlformats.org/markup-compatibility/2006}AlternateContent",
+))
+_XML_SPACE = qn("xml:space")
+# Caractères qu'un <w:t> ne peut pas contenir tels quels (tabulations, sauts de ligne...)
+_RUN_BREAK_RE = re.compile(r"[\t\r\n]")
+_XML_CONTROL_RE = re.compile(r"[\x00-\x1f]")
+
+# Mots-clés par rôle de colonne pour find_columns
+_COLUMN_ROLE_KEYWORDS = {
+    "first": ("prénom", "prenom", "first", "vorname"),
+    "last": ("nom", "lastname", "last", "name"),
+    "org": ("organisation", "société", "societe", "raison", "entreprise", "compagnie", "company", "institution"),
+    "civ": ("civilit", "titre", "title", "civility"),
+    "amt": ("montant", "amount"),
+    "don": ("don", "contribution"),
 }
+# Un lookahead optionnel par rôle : un seul match() renseigne tous les groupes trouvés
+_COLUMN_ROLES_RE = re.compile(
+    "".join(
+        f"(?:(?=.*?(?P<{role}>{'|'.join(map(re.escape, keywords))})))?"
+        for role, keywords in _COLUMN_ROLE_KEYWORDS.items()
+    ),
+    re.DOTALL,
+)
+
+# Expressions régulières compilées une seule fois (appelées pour chaque ligne)
+_WS_RE = re.compile(r"\s+")
+_PLUS_RE = re.compile(r"\s*\+\s*")
+_NUM_RE = re.compile(r"\d+(?:\.\d+)?")
+_NUM_LIMITED_RE = re.compile(r"\d{1,5}(?:[.,]\d+)?")
+_PLACEHOLDER_RE = re.compile(r"\{[^}]+\}")
+_SLUG_RE = re.compile(r"[^\w\s-]", re.UNICODE)
+# Même filtre pour l'ASCII pur, appliqué par str.translate sans passer par le moteur regex
+_SLUG_ASCII_TABLE = {c: None for c in range(128)
+                     if not (chr(c).isalnum() or chr(c).isspace() or chr(c) in "_-")}
+
+
+def _sniff_bom(data: bytes) -> str | None:
+    """Retourne l'encodage annoncé par un BOM en début de fichier, sinon None."""
+    for bom, enc in _BOM_ENCODINGS:
+        if data.startswith(bom):
+            return enc
+    return None
+
+
+# Séparateurs usuels ; pour tout autre séparateur deviné, on garde le moteur Python (plus strict)
+_CSV_SEPARATORS = frozenset(",;\t|")
+
+
+def _sniff_delimiter(text: str) -> str:
+    """Devine le séparateur sur la première ligne, comme pandas avec sep=None."""
+    first_line = io.StringIO(text, newline="").readline()
+    return csv.Sniffer().sniff(first_line).delimiter
+
+
+def _csv_encodings(data: bytes) -> list:
+    """Encodages à essayer, dans l'ordre, pour un CSV commençant par data."""
+    # Un BOM donne l'encodage directement
+    bom_encoding = _sniff_bom(data)
+    # utf-8-sig lit aussi l'UTF-8 sans BOM, inutile de réessayer en "utf-8"
+    return [bom_encoding] if bom_encoding else ["utf-8-sig", "cp1252", "latin1"]
+
+
+def _read_csv_text(text: str, **read_kwargs) -> pd.DataFrame:
+    """Lit un CSV déjà décodé en devinant le séparateur ; lève l'erreur du dernier moteur essayé."""
+    # Séparateur deviné comme le ferait sep=None, puis lecture par le moteur C (bien plus rapide)
+    try:
+        sep = _sniff_delimiter(text)
+        if sep in _CSV_SEPARATORS:
+            # na_filter=False : les cellules vides restent "" (pas de NaN à remplir ensuite)
+            return pd.read_csv(io.StringIO(text, newline=""), sep=sep, dtype=str, na_filter=False,
+                               **read_kwargs)
+    except Exception:
+        pass
+    df = pd.read_csv(io.StringIO(text, newline=""), sep=None, engine="python",
+                     dtype=str, keep_default_na=False, **read_kwargs)
+    # Seules les lignes trop courtes donnent encore des NaN ici
+    return df.fillna("")
+
+
+def read_csv_any(path: str, **read_kwargs) -> pd.DataFrame:
+    """
+    Lit un CSV en devinant encodage et séparateur.
+    read_kwargs (nrows, usecols…) sont transmis à pd.read_csv pour ne lire qu'une partie du fichier.
+    """
+    # Le fichier n'est lu qu'une fois ; chaque encodage candidat est d'abord un simple
+    # décodage en mémoire, bien moins cher qu'un parse complet qui échoue
+    with open(path, "rb") as f:
+        data = f.read()
+    last_exc = None
+    for enc in _csv_encodings(data):
+        try:
+            text = data.decode(enc)
+        except UnicodeDecodeError as e:
+            last_exc = e
+            continue
+        try:
+            return _read_csv_text(text, **read_kwargs)
+        except Exception as e:
+            last_exc = e
+    raise RuntimeError(f"Impossible de lire le CSV: {path}\nDernière erreur: {last_exc}")
+
 
+# Début de fichier lu par read_csv_header : l'en-tête y tient largement
+_CSV_HEADER_PREFIX = 64 * 1024
 
-def read_csv_any(path: str) -> pd.DataFrame:
-    """Lit un CSV en devinant encodage et séparateur."""
-    encodings = ["utf-8-sig", "utf-8", "cp1252", "latin1"]
+
+def read_csv_header(path: str) -> list:
+    """Noms de colonnes d'un CSV (mêmes encodage et séparateur que read_csv_any), sans lire les données."""
+    with open(path, "rb") as f:
+        data = f.read(_CSV_HEADER_PREFIX + 1)
+    if len(data) > _CSV_HEADER_PREFIX:
+        # Gros fichier : encodage, séparateur et en-tête viennent du seul début du fichier
+        data = data[:_CSV_HEADER_PREFIX]
+        for enc in _csv_encodings(data):
+            try:
+                # Décodage incrémental : un caractère multi-octets coupé en fin de préfixe est mis de côté
+                text = codecs.getincrementaldecoder(enc)().decode(data)
+            except UnicodeDecodeError:
+                continue
+            # La dernière ligne est sans doute tronquée
+            end = text.rfind("\n")
+            if end < 0:
+                break  # En-tête plus long que le préfixe
+            try:
+                columns = list(_read_csv_text(text[:end + 1], nrows=0).columns)
+            except Exception:
+                continue
+            # Un en-tête ASCII se lit de même avec tous les encodages candidats ; sinon,
+            # comme read_csv_any, ne garder l'encodage que s'il décode tout le fichier
+            if all(col.isascii() for col in columns) or _decodes_whole_file(path, enc):
+                return columns
+    return list(read_csv_any(path, nrows=0).columns)
+
+
+def _decodes_whole_file(path: str, enc: str) -> bool:
+    """Vrai si tout le fichier se décode avec enc (lu par blocs, sans garder le texte)."""
+    decoder = codecs.getincrementaldecoder(enc)()
+    try:
+        with open(path, "rb") as f:
+            for block in iter(lambda: f.read(1 << 20), b""):
+                decoder.decode(block)
+        decoder.decode(b"", final=True)
+    except UnicodeDecodeError:
+        return False
+    return True
+
+
+# Lignes lues à la fois par count_csv_rows
+_CSV_COUNT_CHUNK = 1 << 16
+
+
+def count_csv_rows(path: str) -> int:
+    """Nombre de lignes de données d'un CSV, comme len(read_csv_any(path)), lu par blocs."""
+    with open(path, "rb") as f:
+        prefix = f.read(_CSV_HEADER_PREFIX)
     last_exc = None
-    for enc in encodings:
+    # Même ordre d'essai que read_csv_any : un octet invalide plus loin fait passer au suivant
+    for enc in _csv_encodings(prefix):
         try:
-            df = pd.read_csv(path, sep=None, engine="python", encoding=enc, dtype=str)
-            return df.fillna("")
+            with open(path, encoding=enc, newline="") as f:
+                try:
+                    sep = _sniff_delimiter(f.readline())
+                    f.seek(0)
+                    if sep in _CSV_SEPARATORS:
+                        chunks = pd.read_csv(f, sep=sep, usecols=[0], dtype=str, na_filter=False,
+                                             chunksize=_CSV_COUNT_CHUNK)
+                        return sum(len(chunk) for chunk in chunks)
+                except Exception:
+                    f.seek(0)
+                chunks = pd.read_csv(f, sep=None, engine="python", usecols=[0], dtype=str,
+                                     keep_default_na=False, chunksize=_CSV_COUNT_CHUNK)
+                return sum(len(chunk) for chunk in chunks)
         except Exception as e:
             last_exc = e
     raise RuntimeError(f"Impossible de lire le CSV: {path}\nDernière erreur: {last_exc}")
 
 
 def normalize_spaces(s: str) -> str:
-    return re.sub(r"\s+", " ", str(s)).strip()
+    return _WS_RE.sub(" ", str(s)).strip()
 
 
 def find_columns(df: pd.DataFrame):
     """Devine les colonnes de prénom / nom / organisation / montant / civilité."""
-    cols = {c: c.lower() for c in df.columns}
-    def col_like(*keys):
-        for k in cols:
-            lk = cols[k]
-            if any(kw in lk for kw in keys):
-                return k
-        return None
-
-    first = col_like("prénom", "prenom", "first", "vorname")
-    last = col_like("nom", "lastname", "last", "name")
-    org = col_like("organisation", "société", "societe", "raison", "entreprise", "compagnie", "company", "institution")
-    civ = col_like("civilit", "titre", "title", "civility")
-    # Check for "montant" first, then more general terms
-    amt = col_like("montant", "amount")
-    if not amt:
-        amt = col_like("don", "contribution")
+    # Ne dépend que des noms de colonnes : même résultat pour tout CSV de même en-tête
+    return _find_columns_cached(tuple(df.columns))
 
-    return first, last, org, civ, amt
 
+@lru_cache(maxsize=32)
+def _find_columns_cached(columns: tuple):
+    # Un seul passage sur les colonnes : chaque match indique tous les rôles reconnus
+    found = {}
+    for c in columns:
+        m = _COLUMN_ROLES_RE.match(c.lower())
+        for role, hit in m.groupdict().items():
+            if hit is not None and role not in found:
+                found[role] = c
+        if len(found) == len(_COLUMN_ROLE_KEYWORDS):
+            break
 
+    # Check for "montant" first, then more general terms
+    amt = found.get("amt") or found.get("don")
+    return found.get("first"), found.get("last"), found.get("org"), found.get("civ"), amt
+
+
+@lru_cache(maxsize=8192)  # Les montants standards ("100", "500"…) se répètent
 def parse_amount(val: str) -> float:
     """
     Extrait un montant d'une chaîne, gère "55 + 100" -> 155.
@@ -84,12 +291,12 @@ def parse_amount(val: str) -> float:
     s = val.replace("\xa0", " ")
     # Si on a un pattern type "55 + 100 + 40"
     if "+" in s:
-        parts = [p.strip() for p in re.split(r"\s*\+\s*", s) if p.strip()]
+        # Nettoyage fait une seule fois sur toute la chaîne : aucun motif remplacé
+        # ne contient "+", le découpage en parties donne donc les mêmes nombres
+        pc = s.replace(" ", "").replace(".-", "").replace(".–", "").replace(".", "").replace(",", ".")
         total = 0.0
-        for p in parts:
-            pc = p.replace(" ", "").replace("\u00A0", "").replace(".-", "").replace(".–", "")
-            pc = pc.replace(".", "").replace(",", ".")
-            nums = re.findall(r"\d+(?:\.\d+)?", pc)
+        for p in _PLUS_RE.split(pc):
+            nums = _NUM_RE.findall(p)
             if not nums:
                 continue
             valf = float(nums[0])
@@ -99,35 +306,40 @@ def parse_amount(val: str) -> float:
         return total
 
     # Sinon, on prend le dernier nombre « pertinent »
-    nums = re.findall(r"\d{1,5}(?:[.,]\d+)?", s)
+    nums = _NUM_LIMITED_RE.findall(s)
     if not nums:
         return 0.0
+    # La regex garantit des chiffres avec au plus un séparateur : float() ne peut pas échouer
+    cleaned = [float(n.replace(".", "").replace(",", ".")) for n in nums]
     # Retire les CP probables (4 chiffres) si d'autres nombres existent
-    cleaned = []
-    for n in nums:
-        n2 = n.replace(".", "").replace(",", ".")
-        try:
-            f = float(n2)
-        except Exception:
-            continue
-        if 1000 <= f <= 9999 and len(nums) > 1:
-            continue
-        cleaned.append(f)
+    if len(nums) > 1:
+        cleaned = [f for f in cleaned if not 1000 <= f <= 9999]
     return cleaned[-1] if cleaned else 0.0
 
 
-def find_amount_in_row(row, amount_col: str | None) -> float:
+def amount_like_columns(columns) -> list:
+    """Colonnes dont le nom évoque un montant ('montant', 'amount', 'don')."""
+    return [c for c in columns if any(k in c.lower() for k in ("montant", "amount", "don"))]
+
+
+def find_amount_in_row(row, amount_col: str | None, amount_like_cols=None, reversed_cols=None) -> float:
+    """
+    Montant d'une ligne. Pour un appel par ligne, passer amount_like_columns(df.columns)
+    et list(reversed(df.columns)) calculés une fois évite de les recalculer à chaque ligne.
+    """
     if amount_col and amount_col in row:
         return parse_amount(str(row[amount_col]))
     # Essaye colonnes contenant 'montant'…
-    for c in row.index:
-        lc = c.lower()
-        if any(k in lc for k in ["montant", "amount", "don"]):
-            v = parse_amount(str(row[c]))
-            if v > 0:
-                return v
+    if amount_like_cols is None:
+        amount_like_cols = amount_like_columns(row.keys())
+    for c in amount_like_cols:
+        v = parse_amount(str(row[c]))
+        if v > 0:
+            return v
     # Sinon balaye de droite à gauche (probables colonnes fin de tableau)
-    for c in reversed(row.index.tolist()):
+    if reversed_cols is None:
+        reversed_cols = reversed(list(row.keys()))
+    for c in reversed_cols:
         v = parse_amount(str(row[c]))
         if v > 0 and v < 50000:
             return v
@@ -136,9 +348,10 @@ def find_amount_in_row(row, amount_col: str | None) -> float:
 
 def is_organization(name_fields) -> bool:
     blob = " ".join([str(x) for x in name_fields]).strip()
-    return any(k in blob for k in ORG_KEYWORDS)
+    return _ORG_RE.search(blob) is not None  # Un seul parcours pour tous les mots-clés
 
 
+@lru_cache(maxsize=8192)  # Les prénoms se répètent d'une ligne à l'autre
 def infer_civility(firstname: str, fallback="Monsieur/Madame") -> str:
     fn = normalize_spaces(firstname).lower()
     # Cas couples "X et Y"
@@ -148,7 +361,7 @@ def infer_civility(firstname: str, fallback="Monsieur/Madame") -> str:
     base = fn.split()[0] if fn else ""
     if base in FEMALE_NAMES:
         return "Madame"
-    if any(base.endswith(suf) for suf in FEMALE_HINTS):
+    if base.endswith(FEMALE_HINTS):  # Un seul appel C pour toutes les terminaisons
         return "Madame"
     return "Monsieur" if base else fallback
 
@@ -164,7 +377,7 @@ def build_display_name(row, first_col, last_col, org_col, civ_col):
 
     # Nom « brut » potentiel depuis des colonnes combinées
     if not (firstname or lastname or orgname):
-        for c in row.index:
+        for c in row.keys():
             lc = c.lower()
             if any(k in lc for k in ["nom complet", "donataire", "beneficiaire", "raison sociale", "nom"]):
                 candidate = normalize_spaces(str(row[c]))
@@ -172,6 +385,13 @@ def build_display_name(row, first_col, last_col, org_col, civ_col):
                     orgname = candidate
                     break
 
+    civ_raw = row.get(civ_col, "") if civ_col else ""
+    return _display_name(firstname, lastname, orgname, civ_raw)
+
+
+@lru_cache(maxsize=4096)
+def _display_name(firstname, lastname, orgname, civ_raw):
+    """Cœur de build_display_name, mémorisé : les mêmes noms reviennent souvent d'une ligne à l'autre."""
     # Entreprise / organisation
     if orgname and is_organization([orgname]):
         return normalize_spaces(orgname)
@@ -184,8 +404,8 @@ def build_display_name(row, first_col, last_col, org_col, civ_col):
 
     # Cas général personne physique
     civ = ""
-    if civ_col and row.get(civ_col, ""):
-        civ = normalize_spaces(str(row[civ_col]))
+    if civ_raw:
+        civ = normalize_spaces(str(civ_raw))
     else:
         civ = infer_civility(firstname)
 
@@ -197,95 +417,300 @@ def build_display_name(row, first_col, last_col, org_col, civ_col):
     return full
 
 
-def get_placeholders_from_template(template_path: str) -> list:
-    """Extract placeholders from a DOCX template (e.g., {NOM}, {MONTANT})."""
+def get_placeholders_from_template(template_path) -> list:
+    """
+    Extract placeholders from a DOCX template (e.g., {NOM}, {MONTANT}), in reading order.
+    template_path may also be the .docx content (bytes) or a binary file-like object.
+    """
+    if isinstance(template_path, (bytes, bytearray)):
+        template_path = io.BytesIO(template_path)
+    if not isinstance(template_path, (str, os.PathLike)):
+        return list(_scan_placeholders(template_path))  # In memory: nothing to key a cache on
+    # Rescanning an unchanged file returns the cached result; a modified file has a new key
+    st = os.stat(template_path)
+    return list(_cached_placeholders(os.path.abspath(template_path), st.st_mtime_ns, st.st_size))
+
+
+@lru_cache(maxsize=64)
+def _cached_placeholders(template_path, mtime_ns, size) -> tuple:
+    return _scan_placeholders(template_path)
+
+
+def invalidate_placeholder_cache():
+    """Forget every cached template scan (e.g. before an explicit "reload template")."""
+    _cached_placeholders.cache_clear()
+
+
+def _scan_placeholders(template_path) -> tuple:
     doc = Document(template_path)
-    placeholders = set()
+    placeholders = {}  # Ordered set: first occurrence wins
     
-    # Check paragraphs
-    for p in doc.paragraphs:
-        matches = re.findall(r'\{[^}]+\}', p.text)
-        placeholders.update(matches)
-    
-    # Check tables
-    for table in doc.tables:
-        for row in table.rows:
-            for cell in row.cells:
-                for p in cell.paragraphs:
-                    matches = re.findall(r'\{[^}]+\}', p.text)
-                    placeholders.update(matches)
+    # Every paragraph of the body in document order, table cells included
+    for p in doc.element.body.iter(_W_P):
+        text = "".join(p.itertext(_W_T))
+        # Most paragraphs hold no placeholder at all
+        if '{' not in text:
+            continue
+        placeholders.update(dict.fromkeys(_PLACEHOLDER_RE.findall(text)))
     
-    return sorted(list(placeholders))
+    return tuple(placeholders)
+
+
+@lru_cache(maxsize=32)
+def _keys_pattern(keys):
+    """Regex alternation matching any of the keys (str or bytes), longest first."""
+    separator = b"|" if isinstance(keys[0], bytes) else "|"
+    ordered = sorted(keys, key=len, reverse=True)
+    if re2 is not None:
+        try:
+            return re2.compile(separator.join(re2.escape(k) for k in ordered))
+        except Exception:
+            pass  # Fall back to the standard engine
+    return re.compile(separator.join(re.escape(k) for k in ordered))
 
 
 def replace_placeholders(doc: Document, mapping):
     """Remplace les placeholders dans paragraphes ET tableaux, même s'ils sont fragmentés entre plusieurs runs."""
-    def _replace_in_paragraph(p):
-        for key, val in mapping.items():
-            if key in p.text:
-                # First try simple replacement in individual runs
-                replaced = False
-                for run in p.runs:
-                    if key in run.text:
-                        run.text = run.text.replace(key, val)
-                        replaced = True
-                
-                # If not replaced, the placeholder might be split across runs
-                if not replaced and key in p.text:
-                    # Rebuild the paragraph by merging runs
-                    full_text = p.text
-                    if key in full_text:
-                        # Replace in full text
-                        new_text = full_text.replace(key, val)
-                        
-                        # Clear all runs and create a single run with replaced text
-                        # Keep the style of the first run
-                        if p.runs:
-                            first_run = p.runs[0]
-                            # Store style properties
-                            font_name = first_run.font.name
-                            font_size = first_run.font.size
-                            bold = first_run.font.bold
-                            italic = first_run.font.italic
-                            
-                            # Clear all runs
-                            for run in p.runs[:]:
-                                run.text = ''
-                            
-                            # Set new text in first run
-                            first_run.text = new_text
-                            # Restore style
-                            if font_name:
-                                first_run.font.name = font_name
-                            if font_size:
-                                first_run.font.size = font_size
-                            if bold is not None:
-                                first_run.font.bold = bold
-                            if italic is not None:
-                                first_run.font.italic = italic
-
-    # Paragraphes
-    for p in doc.paragraphs:
-        _replace_in_paragraph(p)
-
-    # Tableaux
-    for table in doc.tables:
-        for row in table.rows:
-            for cell in row.cells:
-                for p in cell.paragraphs:
-                    _replace_in_paragraph(p)
+    if not mapping:
+        return
+    # One alternation over all keys (longest first) instead of one scan per key
+    pattern = _keys_pattern(tuple(mapping))
+    # With brace-delimited keys, text without any '{' cannot contain a placeholder
+    brace_keys = all("{" in k for k in mapping)
+
+    def _repl(m):
+        return mapping[m.group(0)]
+
+    if len(mapping) == 1:
+        # A single key needs no alternation: str.replace is much cheaper than re.sub
+        (key, value), = mapping.items()
+
+        def _substitute(text):
+            return text.replace(key, value)
+    else:
+        def _substitute(text):
+            return pattern.sub(_repl, text)
+
+    body = doc.element.body
+
+    # Fast pass straight on the <w:t> text nodes (paragraphs and tables alike),
+    # bypassing python-docx's paragraph/run proxies
+    runs_with_breaks = []
+    for t in body.iter(_W_T):
+        text = t.text
+        if not text or (brace_keys and "{" not in text):
+            continue
+        new_text = _substitute(text)
+        if new_text == text:
+            continue
+        if _RUN_BREAK_RE.search(new_text):
+            # Tabs and line breaks must become <w:tab/>/<w:br/>: let python-docx rebuild the run
+            if t.getparent() not in runs_with_breaks:
+                runs_with_breaks.append(t.getparent())
+            continue
+        t.text = new_text
+        if new_text != new_text.strip():
+            t.set(_XML_SPACE, "preserve")
+    for r in runs_with_breaks:
+        run = Run(r, doc)
+        run.text = _substitute(run.text)
+
+    # Placeholders split across several runs survive the pass above:
+    # merge those paragraphs into their first run
+    for p_el in body.iter(_W_P):
+        full_text = "".join(t.text or "" for t in p_el.iterfind(_P_RUN_TEXT))
+        if brace_keys and "{" not in full_text:
+            continue
+        if not pattern.search(full_text):
+            continue
+        runs = _text_runs(Paragraph(p_el, doc))
+        if runs:
+            _merge_runs(runs, _substitute("".join(run.text for run in runs)))
+
+
+def _text_runs(p):
+    """Runs du paragraphe qui ne portent que du texte (ni image, ni forme, ni zone de texte)."""
+    return [run for run in p.runs
+            if not any(child.tag in _RUN_OBJECT_TAGS for child in run._r)]
+
+
+def _merge_runs(runs, new_text):
+    """Remplace le texte des runs par un seul run, avec le style du premier run."""
+    # Clear all runs and create a single run with replaced text
+    # Keep the style of the first run
+    first_run = runs[0]
+    # Store style properties
+    font_name = first_run.font.name
+    font_size = first_run.font.size
+    bold = first_run.font.bold
+    italic = first_run.font.italic
+
+    # Clear all runs
+    for run in runs:
+        run.text = ''
+
+    # Set new text in first run
+    first_run.text = new_text
+    # Restore style
+    if font_name:
+        first_run.font.name = font_name
+    if font_size:
+        first_run.font.size = font_size
+    if bold is not None:
+        first_run.font.bold = bold
+    if italic is not None:
+        first_run.font.italic = italic
+
+
+def merge_split_placeholders(doc: Document, placeholders):
+    """Fusionne les runs des paragraphes où un placeholder est fragmenté entre plusieurs runs.
+
+    Après ce passage, chaque placeholder tient dans un seul nœud <w:t> ; les
+    paragraphes dont les placeholders sont intacts gardent leur mise en forme.
+    """
+    if not placeholders:
+        return
+    pattern = _keys_pattern(tuple(placeholders))
+    for p_el in doc.element.body.iter(_W_P):
+        texts = [t.text or "" for t in p_el.iterfind(_P_RUN_TEXT)]
+        whole = sum(1 for _ in pattern.finditer("".join(texts)))
+        if whole > sum(1 for text in texts for _ in pattern.finditer(text)):
+            runs = _text_runs(Paragraph(p_el, doc))
+            if runs:
+                _merge_runs(runs, "".join(run.text for run in runs))
 
 
 def slugify(value: str) -> str:
     value = normalize_spaces(value)
-    value = re.sub(r"[^\w\s-]", "", value, flags=re.UNICODE)
+    value = value.translate(_SLUG_ASCII_TABLE) if value.isascii() else _SLUG_RE.sub("", value)
     value = value.strip().replace(" ", "_")
     return value[:120]
 
 
+# Output writer threads and max documents queued for writing
+_WRITER_THREADS = 4
+_MAX_PENDING_WRITES = 64
+# Buffer size of the ZIP archive: few large write() syscalls instead of one per 8 KiB
+_WRITE_BUFFER_SIZE = 1 << 20
+# Documents per worker process below which starting the process costs more than it saves
+_MIN_DOCS_PER_WORKER = 8
+
+# Parsed template of a render worker process, set once by _init_render_worker
+_worker_template = None
+
+
+def _load_template(template_bytes, placeholders=()):
+    """Parse the template once and prepare everything needed to render documents.
+
+    Returns (document part, pristine copy of its XML tree, raw template), where the
+    raw template is (zip entries, main part name, main part XML) when documents can
+    be rendered by plain byte substitution on the package, or None otherwise.
+    """
+    part = Document(io.BytesIO(template_bytes)).part
+    # Make every placeholder fit in a single <w:t> so it can be replaced in place
+    merge_split_placeholders(part.document, placeholders)
+    raw = None
+    if placeholders:
+        for t in part.element.body.iter(_W_T):
+            if t.text and any(key in t.text for key in placeholders):
+                t.set(_XML_SPACE, "preserve")
+        xml = serialize_part_xml(part.element)
+        in_text = "\n".join(t.text or "" for t in part.element.body.iter(_W_T))
+        # Placeholders found anywhere else in the XML (attributes, field codes...)
+        # would be replaced by a byte substitution but not by python-docx
+        if all(xml.count(xml_escape(key).encode("utf-8")) == in_text.count(key) for key in placeholders):
+            partname = part.partname.lstrip("/")
+            with zipfile.ZipFile(io.BytesIO(template_bytes)) as zf:
+                entries = [(info, xml if info.filename == partname else zf.read(info))
+                           for info in zf.infolist()]
+            raw = (entries, partname, xml)
+    return part, copy.deepcopy(part.element), raw
+
+
+def _specialize_template(template_bytes, constant_mapping):
+    """Substitute placeholders shared by every document into the template once."""
+    doc = Document(io.BytesIO(template_bytes))
+    replace_placeholders(doc, constant_mapping)
+    buf = io.BytesIO()
+    doc.save(buf)
+    return buf.getvalue()
+
+
+def _init_render_worker(template_bytes, placeholders=()):
+    """Process pool initializer: parse the template once per worker process."""
+    global _worker_template
+    _worker_template = _load_template(template_bytes, placeholders)
+
+
+@lru_cache(maxsize=32)
+def _raw_keys(keys):
+    """XML-escaped, UTF-8 encoded placeholder keys and their alternation (fixed for a whole run)."""
+    encoded = tuple(xml_escape(k).encode("utf-8") for k in keys)
+    return encoded, _keys_pattern(encoded)
+
+
+def _render_raw(raw, mapping):
+    """Render a document by byte substitution on the template package, without python-docx."""
+    entries, partname, xml = raw
+    keys, pattern = _raw_keys(tuple(mapping))
+    values = [xml_escape(v).encode("utf-8") for v in mapping.values()]
+    if len(keys) == 1:
+        xml = xml.replace(keys[0], values[0])
+    else:
+        replacements = dict(zip(keys, values))
+        xml = pattern.sub(lambda m: replacements[m.group(0)], xml)
+    buf = io.BytesIO()
+    with zipfile.ZipFile(buf, "w", compression=zipfile.ZIP_DEFLATED, compresslevel=1) as zf:
+        for info, data in entries:
+            zf.writestr(info.filename, xml if info.filename == partname else data)
+    return buf.getvalue()
+
+
+def _render_document(template, mapping):
+    """Render a single document from the parsed template and return its .docx bytes."""
+    part, pristine, raw = template
+    # Values with tabs, line breaks or other control characters need python-docx
+    if raw is not None and not any(_XML_CONTROL_RE.search(v) for v in mapping.values()):
+        return _render_raw(raw, mapping)
+    # Work on a fresh copy of the tree instead of unzipping and re-parsing the package
+    # Private attribute of python-docx's XmlPart (tested with python-docx 1.2.0,
+    # pinned < 2 in requirements.txt): the part then saves the copy
+    part._element = copy.deepcopy(pristine)
+    doc = part.document
+    replace_placeholders(doc, mapping)
+    buf = io.BytesIO()
+    doc.save(buf)
+    return buf.getvalue()
+
+
+def _render_task(mapping):
+    """Process pool entry point: render one document with the worker's template."""
+    return _render_document(_worker_template, mapping)
+
+
+def _claim_path(path):
+    """Atomically create an empty file at path; False if it already exists."""
+    try:
+        os.close(os.open(path, os.O_CREAT | os.O_EXCL | os.O_WRONLY))
+    except FileExistsError:
+        return False
+    return True
+
+
+def _write_file(path, data):
+    """Write bytes to a file (runs on the output writer threads)."""
+    # The document is already complete in memory: hand it to the OS directly,
+    # without copying it through a write buffer first
+    with open(path, "wb", buffering=0) as f:
+        view = memoryview(data)
+        while view:
+            view = view[f.write(view):]
+
+
 def generate_documents(csv_path, template_path, outdir, field_mapping, 
                       filename_field=None, filename_prefix="", filename_suffix="",
-                      make_zip=False, progress_callback=None):
+                      make_zip=False, progress_callback=None, workers=1,
+                      keep_individual_files=True, row_limit=None):
     """
     Generate DOCX documents from CSV and template.
     
@@ -303,59 +728,43 @@ def generate_documents(csv_path, template_path, outdir, field_mapping,
         filename_suffix: Suffix for output filenames
         make_zip: Whether to create a ZIP archive
         progress_callback: Callback function(current, total, message)
+        workers: Number of worker processes rendering documents in parallel
+                 (1 = render in this process, None = one per CPU); small batches
+                 use fewer workers, or none
+        keep_individual_files: With make_zip, False writes the documents only
+                               into the ZIP archive (no individual .docx files)
+        row_limit: Only read the first row_limit rows of the CSV (e.g. for a quick
+                   test run); None reads them all
     
     Returns:
-        (generated_files, zip_path)
+        (generated_files, zip_path) - generated_files holds the archive names
+        of the documents instead of file paths when only the ZIP is written
     """
     if not os.path.exists(csv_path):
         raise FileNotFoundError(f"CSV introuvable: {csv_path}")
     if not os.path.exists(template_path):
         raise FileNotFoundError(f"Modèle .docx introuvable: {template_path}")
 
-    df = read_csv_any(csv_path)
+    df = read_csv_any(csv_path, nrows=row_limit)
     os.makedirs(outdir, exist_ok=True)
 
     # Validate that mapped columns exist in CSV
     csv_columns = set(df.columns)
-    missing_columns = []
-    
-    for placeholder, csv_spec in field_mapping.items():
-        # Skip fallback keys for now (we'll check them separately)
-        if placeholder.endswith('_fallback'):
-            continue
-        
-        # Extract column names from the spec
-        if isinstance(csv_spec, str) and csv_spec:
-            # The runtime behavior is:
-            # 1. If spec contains spaces, try to split and combine multiple columns
-            # 2. If that yields no results (columns don't exist), try as single column name
-            
-            # First, check if the whole spec is a valid column name (handles columns with spaces)
-            if csv_spec in csv_columns:
-                # Valid single column, no problem
-                continue
-            
-            # If not, check if it's meant to be a column combination
-            if ' ' in csv_spec:
-                col_names = csv_spec.split()
-                # Check if any of the split columns exist
-                found_any = any(col_name in csv_columns for col_name in col_names)
-                
-                if not found_any:
-                    # None of the columns exist, this is an error
-                    missing_columns.append((placeholder, csv_spec))
-                # If some exist, that's OK (combination will work with available columns)
-            else:
-                # Single column that doesn't exist
-                missing_columns.append((placeholder, csv_spec))
-    
+    # A spec is fine if it is a column name itself (even with spaces), or a
+    # space-separated combination of which at least one column exists
+    # (the combination then works with the available columns)
+    missing_columns = [
+        (placeholder, csv_spec) for placeholder, csv_spec in field_mapping.items()
+        if not placeholder.endswith('_fallback') and isinstance(csv_spec, str) and csv_spec
+        and csv_spec not in csv_columns
+        and csv_columns.isdisjoint(csv_spec.split() if ' ' in csv_spec else (csv_spec,))
+    ]
     # Check fallback columns
-    for key, fallback_cols in field_mapping.items():
-        if key.endswith('_fallback') and isinstance(fallback_cols, list):
-            placeholder = key.replace('_fallback', '')
-            for col_name in fallback_cols:
-                if col_name and col_name not in csv_columns:
-                    missing_columns.append((placeholder, col_name))
+    missing_columns += [
+        (key.replace('_fallback', ''), col_name) for key, fallback_cols in field_mapping.items()
+        if key.endswith('_fallback') and isinstance(fallback_cols, list)
+        for col_name in fallback_cols if col_name and col_name not in csv_columns
+    ]
     
     # If there are missing columns, provide a helpful warning
     if missing_columns:
@@ -376,167 +785,254 @@ def generate_documents(csv_path, template_path, outdir, field_mapping,
         # Raise a descriptive error so users know what went wrong
         raise ValueError(warning_msg)
 
-    generated_files = []
+    if workers is None:
+        workers = os.cpu_count() or 1
+
+    render_mappings = []  # Placeholder mapping of each document to render
+    out_paths = []  # Output path of each document to render
     total_rows = len(df)
     skipped_rows = []  # Track skipped rows for debugging
+    # Documents go to individual files unless only the ZIP archive is wanted
+    write_files = keep_individual_files or not make_zip
+    # Names already taken: skipped without a syscall (inside the archive only
+    # names of this run can collide)
+    existing_names = set(os.listdir(outdir)) if write_files else set()
     
     print(f"[DEBUG] Starting to process {total_rows} CSV rows...")
-    
-    for idx, row in df.iterrows():
-        if progress_callback:
-            progress_callback(idx, total_rows, f"Processing row {idx+1}/{total_rows}")
-        
-        # Build mapping from template placeholders to values
-        mapping = {}
-        skip_row = False
-        
-        for placeholder, csv_spec in field_mapping.items():
-            # Skip fallback keys (processed separately)
-            if placeholder.endswith('_fallback'):
-                continue
-            
-            value = ""
-            all_columns_for_this_placeholder = []  # Track all columns used for this placeholder
-            
-            # Handle empty csv_spec (unmapped placeholder)
-            if not csv_spec or csv_spec == "":
-                # Leave value as empty string - this is intentional for unmapped placeholders
-                mapping[placeholder] = value
-                continue
-            
-            # Check if it's a single column name (even if it contains spaces)
-            if isinstance(csv_spec, str) and csv_spec in row:
-                # It's a valid single column name, even if it has spaces
-                value = str(row[csv_spec]).strip()
-                all_columns_for_this_placeholder.append(csv_spec)
-            elif isinstance(csv_spec, str) and ' ' in csv_spec:
-                # It might be a combination of columns (space-separated)
-                parts = []
-                for col_name in csv_spec.split():
-                    if col_name in row:
-                        all_columns_for_this_placeholder.append(col_name)
-                        col_val = str(row[col_name]).strip()
-                        if col_val:
-                            parts.append(col_val)
-                value = ' '.join(parts)
-            
-            # Try fallback columns if value is still empty
-            if isinstance(csv_spec, str) and not value:
-                fallback_key = f"{placeholder}_fallback"
-                if fallback_key in field_mapping:
-                    fallback_cols = field_mapping[fallback_key]
-                    for col in fallback_cols:
-                        all_columns_for_this_placeholder.append(col)
-                        if col in row:
-                            val = str(row[col]).strip()
-                            if val:
-                                value = val
-                                break
-            
-            mapping[placeholder] = value
-            
-            # Check if ALL columns for this placeholder are empty
-            if all_columns_for_this_placeholder:
-                all_empty = all(not str(row[col]).strip() for col in all_columns_for_this_placeholder if col in row)
-                if all_empty:
-                    print(f"[DEBUG] Row {idx+1}: Skipping because all columns for {placeholder} are empty: {all_columns_for_this_placeholder}")
-                    skip_row = True
-                    break  # No need to check other placeholders
-        
-        # Skip if any placeholder has all its columns empty
-        if skip_row:
-            skipped_rows.append(idx + 1)
+
+    # Decide which rows to skip for the whole DataFrame at once, so skipped rows
+    # never reach the per-row loop below
+    stripped = {col: df[col].astype(str).str.strip() for col in df.columns}
+    nonempty = pd.DataFrame({col: values.ne("") for col, values in stripped.items()}, index=df.index)
+    # Skip ONLY if the row has no data at all in ANY CSV column
+    # This is more robust than checking mapped placeholders, which might be unmapped
+    skip = ~nonempty.any(axis=1) if len(df.columns) else pd.Series(True, index=df.index)
+    for placeholder, csv_spec in field_mapping.items():
+        # Skip fallback keys (processed with their placeholder) and unmapped placeholders
+        if placeholder.endswith('_fallback') or not csv_spec or not isinstance(csv_spec, str):
             continue
-        
-        # Skip ONLY if the row has no data at all in ANY CSV column
-        # This is more robust than checking mapped placeholders, which might be unmapped
-        row_has_data = any(str(row[col]).strip() for col in df.columns)
-        
-        if not row_has_data:
-            skipped_rows.append(idx + 1)  # +1 for 1-based row number
+        # All columns feeding this placeholder: the column(s) of its spec, then its fallbacks
+        if csv_spec in csv_columns:
+            placeholder_columns = [csv_spec]
+        elif ' ' in csv_spec:
+            placeholder_columns = [col for col in csv_spec.split() if col in csv_columns]
+        else:
+            placeholder_columns = []
+        placeholder_columns += field_mapping.get(f"{placeholder}_fallback", [])
+        if not placeholder_columns:
             continue
+        # Skip rows where ALL columns for this placeholder are empty
+        existing = [col for col in placeholder_columns if col in csv_columns]
+        all_empty = ~nonempty[existing].any(axis=1) if existing else pd.Series(True, index=df.index)
+        for idx in (all_empty & ~skip).to_numpy().nonzero()[0]:
+            print(f"[DEBUG] Row {idx+1}: Skipping because all columns for {placeholder} are empty: {placeholder_columns}")
+        skip |= all_empty
+    skip = skip.to_numpy()
+    skipped_rows = [idx + 1 for idx in skip.nonzero()[0]]  # 1-based row numbers
+    kept_rows = (~skip).nonzero()[0]
+
+    # Resolve each placeholder's spec to CSV columns once, instead of for every row:
+    # (placeholder, columns joined with spaces, fallback columns tried in order)
+    mapping_plan = []
+    for placeholder, csv_spec in field_mapping.items():
+        # Skip fallback keys (attached to their placeholder below)
+        if placeholder.endswith('_fallback'):
+            continue
+        columns = fallback_cols = ()
+        # Empty csv_spec (unmapped placeholder) leaves the value as an empty string
+        if csv_spec and isinstance(csv_spec, str):
+            if csv_spec in csv_columns:
+                # A single column name (even if it contains spaces)
+                columns = (csv_spec,)
+            elif ' ' in csv_spec:
+                # A combination of columns (space-separated)
+                columns = tuple(col for col in csv_spec.split() if col in csv_columns)
+            fallback_cols = tuple(col for col in field_mapping.get(f"{placeholder}_fallback", ())
+                                  if col in csv_columns)
+        mapping_plan.append((placeholder, columns, fallback_cols))
+
+    # Compute each placeholder's values column-wise for all kept rows at once
+    placeholders = [placeholder for placeholder, _, _ in mapping_plan]
+    value_columns = []
+    for placeholder, columns, fallback_cols in mapping_plan:
+        value = pd.Series("", index=df.index, dtype=object)
+        for col in columns:
+            # Join the non-empty values of the combined columns with spaces
+            part = stripped[col]
+            value = value.mask(part != "", (value + " " + part).where(value != "", part))
+        # Try fallback columns where the value is still empty
+        for col in fallback_cols:
+            value = value.where(value != "", stripped[col])
+        value_columns.append(value.to_numpy()[kept_rows])
+    row_values = zip(*value_columns) if value_columns else repeat(())
+
+    # The filename logic below is the only per-row reader of CSV cells: only
+    # its columns are turned into (cheap) plain dicts; values are already
+    # strings (read_csv_any reads with dtype=str, NaN filled)
+    filename_columns = [col for col in dict.fromkeys((filename_field or "").split()) if col in csv_columns]
+    rows = df.iloc[kept_rows][filename_columns].to_dict("records") if filename_columns else repeat({})
+
+    generated_files = []
+    zip_path = None
+    # Output names are claimed (as empty files) from here on: any error must release them
+    try:
+        for idx, row, values in zip(kept_rows.tolist(), rows, row_values):
+            # Build mapping from template placeholders to values
+            mapping = dict(zip(placeholders, values))
         
-        # Open a new Document based on the template for EACH row
-        doc = Document(template_path)
-        replace_placeholders(doc, mapping)
-        
-        # Determine filename
-        if filename_field:
-            print(f"[DEBUG] Row {idx+1}: Processing filename_field: '{filename_field}'")
-            # Check if it's a combination of fields (space-separated)
-            if ' ' in filename_field:
-                parts = []
-                for col_name in filename_field.split():
-                    print(f"[DEBUG]   Processing filename part: '{col_name}'")
-                    # Check if it's a template placeholder
-                    if col_name.startswith('__TEMPLATE__'):
-                        # Extract placeholder name and use its mapped value
-                        placeholder = col_name.replace('__TEMPLATE__', '')
-                        print(f"[DEBUG]     Template placeholder: {placeholder}")
-                        if placeholder in mapping:
-                            val = str(mapping[placeholder]).strip()
-                            print(f"[DEBUG]     Mapped value: '{val}'")
-                            if val:
-                                parts.append(val)
+            # Determine filename
+            if filename_field:
+                print(f"[DEBUG] Row {idx+1}: Processing filename_field: '{filename_field}'")
+                # Check if it's a combination of fields (space-separated)
+                if ' ' in filename_field:
+                    parts = []
+                    for col_name in filename_field.split():
+                        print(f"[DEBUG]   Processing filename part: '{col_name}'")
+                        # Check if it's a template placeholder
+                        if col_name.startswith('__TEMPLATE__'):
+                            # Extract placeholder name and use its mapped value
+                            placeholder = col_name.replace('__TEMPLATE__', '')
+                            print(f"[DEBUG]     Template placeholder: {placeholder}")
+                            if placeholder in mapping:
+                                val = str(mapping[placeholder]).strip()
+                                print(f"[DEBUG]     Mapped value: '{val}'")
+                                if val:
+                                    parts.append(val)
+                            else:
+                                print(f"[DEBUG]     WARNING: {placeholder} not in mapping!")
+                        elif col_name in row:
+                            # Regular CSV column
+                            col_val = row[col_name].strip()
+                            print(f"[DEBUG]     CSV column value: '{col_val}'")
+                            if col_val:
+                                parts.append(col_val)
                         else:
-                            print(f"[DEBUG]     WARNING: {placeholder} not in mapping!")
-                    elif col_name in row:
-                        # Regular CSV column
-                        col_val = str(row[col_name]).strip()
-                        print(f"[DEBUG]     CSV column value: '{col_val}'")
-                        if col_val:
-                            parts.append(col_val)
+                            print(f"[DEBUG]     WARNING: '{col_name}' not found in row columns")
+                    base_name = slugify('_'.join(parts)) if parts else f"document_{idx}"
+                    print(f"[DEBUG]   Final filename base: '{base_name}'")
+                elif filename_field.startswith('__TEMPLATE__'):
+                    # Single template placeholder
+                    placeholder = filename_field.replace('__TEMPLATE__', '')
+                    print(f"[DEBUG]   Single template placeholder: {placeholder}")
+                    if placeholder in mapping:
+                        base_name = slugify(str(mapping[placeholder]))
+                        print(f"[DEBUG]   Mapped to: '{base_name}'")
                     else:
-                        print(f"[DEBUG]     WARNING: '{col_name}' not found in row columns")
-                base_name = slugify('_'.join(parts)) if parts else f"document_{idx}"
-                print(f"[DEBUG]   Final filename base: '{base_name}'")
-            elif filename_field.startswith('__TEMPLATE__'):
-                # Single template placeholder
-                placeholder = filename_field.replace('__TEMPLATE__', '')
-                print(f"[DEBUG]   Single template placeholder: {placeholder}")
-                if placeholder in mapping:
-                    base_name = slugify(str(mapping[placeholder]))
-                    print(f"[DEBUG]   Mapped to: '{base_name}'")
+                        print(f"[DEBUG]   WARNING: {placeholder} not in mapping!")
+                        base_name = f"document_{idx}"
+                elif filename_field in row:
+                    # Single CSV column
+                    col_val = row[filename_field]
+                    base_name = slugify(col_val)
+                    print(f"[DEBUG]   CSV column '{filename_field}' = '{col_val}' → slugified: '{base_name}'")
                 else:
-                    print(f"[DEBUG]   WARNING: {placeholder} not in mapping!")
-                    base_name = f"document_{idx}"
-            elif filename_field in row:
-                # Single CSV column
-                col_val = str(row[filename_field])
-                base_name = slugify(col_val)
-                print(f"[DEBUG]   CSV column '{filename_field}' = '{col_val}' → slugified: '{base_name}'")
+                    # Column not found - use first non-empty value as fallback
+                    print(f"[DEBUG]   WARNING: filename_field '{filename_field}' not found in CSV columns!")
+                    print(f"[DEBUG]   Available columns: {list(df.columns)[:10]}...")
+                    base_name = slugify(next((v for v in mapping.values() if v), f"document_{idx}"))
+                    print(f"[DEBUG]   Using fallback: '{base_name}'")
             else:
-                # Column not found - use first non-empty value as fallback
-                print(f"[DEBUG]   WARNING: filename_field '{filename_field}' not found in CSV columns!")
-                print(f"[DEBUG]   Available columns: {list(row.index)[:10]}...")
+                # No filename field specified - use first non-empty value as fallback
+                print(f"[DEBUG] Row {idx+1}: No filename_field specified, using fallback")
                 base_name = slugify(next((v for v in mapping.values() if v), f"document_{idx}"))
-                print(f"[DEBUG]   Using fallback: '{base_name}'")
-        else:
-            # No filename field specified - use first non-empty value as fallback
-            print(f"[DEBUG] Row {idx+1}: No filename_field specified, using fallback")
-            base_name = slugify(next((v for v in mapping.values() if v), f"document_{idx}"))
-            print(f"[DEBUG]   Fallback filename: '{base_name}'")
-        
-        fname = f"{filename_prefix}{base_name}{filename_suffix}.docx"
-        out_path = os.path.join(outdir, fname)
+                print(f"[DEBUG]   Fallback filename: '{base_name}'")
         
-        # Handle duplicate filenames
-        counter = 1
-        while os.path.exists(out_path):
-            fname = f"{filename_prefix}{base_name}_{counter}{filename_suffix}.docx"
+            fname = f"{filename_prefix}{base_name}{filename_suffix}.docx"
             out_path = os.path.join(outdir, fname)
-            counter += 1
         
-        doc.save(out_path)
-        generated_files.append(out_path)
+            # Handle duplicate filenames: documents are only written after this loop,
+            # so each name is claimed atomically now (this also keeps two runs
+            # sharing the output folder from overwriting each other's files)
+            counter = 1
+            while fname in existing_names or (write_files and not _claim_path(out_path)):
+                fname = f"{filename_prefix}{base_name}_{counter}{filename_suffix}.docx"
+                out_path = os.path.join(outdir, fname)
+                counter += 1
+            existing_names.add(fname)
+        
+            render_mappings.append(mapping)
+            out_paths.append(out_path)
+
+        # Read the template once; every document is rendered from these bytes
+        with open(template_path, "rb") as f:
+            template_bytes = f.read()
+
+        # Placeholders that resolve to the same value for every row (unmapped ones,
+        # batch-wide dates...) are substituted into the template once, so each
+        # document only has to replace the values that actually vary
+        if len(render_mappings) > 1:
+            first_mapping = render_mappings[0]
+            constant_mapping = {
+                placeholder: value for placeholder, value in first_mapping.items()
+                # A value containing another placeholder would be substituted twice
+                if not any(other in value for other in first_mapping)
+                and all(m[placeholder] == value for m in render_mappings)
+            }
+            if constant_mapping:
+                template_bytes = _specialize_template(template_bytes, constant_mapping)
+                render_mappings = [
+                    {k: v for k, v in m.items() if k not in constant_mapping}
+                    for m in render_mappings
+                ]
+
+        total_docs = len(out_paths)
+        with ExitStack() as stack:
+            # Render documents: each one is independent, so fan out to worker processes
+            placeholders = tuple(render_mappings[0]) if render_mappings else ()
+            # Small batches render in this process: no pool start-up for a handful of documents
+            workers = min(workers, total_docs // _MIN_DOCS_PER_WORKER)
+            if workers > 1:
+                # "spawn" everywhere, as on Windows and macOS: forking a process that runs
+                # other threads (the GUI's Tk loop, cache writers...) can deadlock the
+                # children; workers get the template through initargs, not fork inheritance
+                executor = stack.enter_context(ProcessPoolExecutor(
+                    max_workers=workers, mp_context=multiprocessing.get_context("spawn"),
+                    initializer=_init_render_worker, initargs=(template_bytes, placeholders)
+                ))
+                rendered = executor.map(_render_task, render_mappings,
+                                        chunksize=max(1, total_docs // (workers * 4)))
+            else:
+                template = _load_template(template_bytes, placeholders)
+                rendered = (_render_document(template, mapping) for mapping in render_mappings)
+
+            # Stream each document to disk and into the ZIP as soon as it is rendered,
+            # instead of re-reading every file afterwards to build the archive
+            zf = None
+            if make_zip and total_docs:
+                zip_path = os.path.join(outdir, "generated_documents.zip")
+                # .docx files are already deflate-compressed: store them as-is
+                zip_file = stack.enter_context(open(zip_path, "wb", buffering=_WRITE_BUFFER_SIZE))
+                zf = stack.enter_context(zipfile.ZipFile(
+                    zip_file, "w", compression=zipfile.ZIP_STORED, allowZip64=True
+                ))
+
+            # Disk writes run on background threads so rendering never waits on I/O;
+            # the ZIP is only appended to from this thread (ZipFile isn't thread-safe)
+            writer = stack.enter_context(ThreadPoolExecutor(max_workers=_WRITER_THREADS))
+            pending_writes = deque()
+            for out_path, data in zip(out_paths, rendered):
+                if write_files:
+                    pending_writes.append(writer.submit(_write_file, out_path, data))
+                    if len(pending_writes) >= _MAX_PENDING_WRITES:
+                        # Bound the number of rendered documents held in memory
+                        pending_writes.popleft().result()
+                if zf:
+                    zf.writestr(os.path.basename(out_path), data)
+                generated_files.append(out_path if write_files else os.path.basename(out_path))
+                if progress_callback:
+                    progress_callback(len(generated_files), total_docs,
+                                      f"Generated document {len(generated_files)}/{total_docs}")
+            for future in pending_writes:
+                future.result()  # Re-raise any write error
+    except BaseException:
+        # Release the names claimed for documents that were never written
+        for out_path in out_paths[len(generated_files):] if write_files else ():
+            try:
+                os.remove(out_path)
+            except OSError:
+                pass
+        raise
 
-    zip_path = None
-    if make_zip and generated_files:
-        zip_path = os.path.join(outdir, "generated_documents.zip")
-        with zipfile.ZipFile(zip_path, "w", compression=zipfile.ZIP_DEFLATED) as zf:
-            for fp in generated_files:
-                zf.write(fp, arcname=os.path.basename(fp))
-    
     # Debug output
     print(f"[DEBUG] Document generation summary:")
     print(f"[DEBUG]   - Total CSV rows: {total_rows}")
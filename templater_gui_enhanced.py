@@ -10,18 +10,21 @@ Features:
 - Drag and drop support for files
 """
 import os
-import json
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox
 from tkinterdnd2 import DND_FILES, TkinterDnD
 import threading
+import time
 import hashlib
+from functools import lru_cache, partial
 from pathlib import Path
+import json_utils
 from templater_core import (
-    read_csv_any, get_placeholders_from_template, generate_documents
+    read_csv_header, count_csv_rows, get_placeholders_from_template, generate_documents
 )
 
 
+@lru_cache(maxsize=1)  # Fixed for the process lifetime: resolve and create it once
 def get_config_dir():
     """Get OS-appropriate configuration directory"""
     if os.name == 'nt':  # Windows
@@ -38,21 +41,99 @@ def get_config_dir():
     return config_dir
 
 
+@lru_cache(maxsize=256)
 def get_config_key(csv_path, template_path):
     """Generate a unique config key for a csv+template combination"""
-    combined = f"{csv_path}|{template_path}"
-    return hashlib.md5(combined.encode()).hexdigest()
+    h = hashlib.blake2b(digest_size=16)
+    h.update(os.fsencode(csv_path))
+    h.update(b"\0")  # Cannot appear in a path, so two different pairs never hash the same bytes
+    h.update(os.fsencode(template_path))
+    return h.hexdigest()
+
+
+# Part of every cache key: bump it when a cached value changes format,
+# so files written by an older version are never read back
+_CACHE_VERSION = 1
+# Cache files kept on disk; the least recently used ones are removed beyond that
+_CACHE_MAX_FILES = 256
+
+
+def cached_file_info(path, kind, compute):
+    """Return compute(path), cached on disk as JSON until the file's mtime or size changes"""
+    st = os.stat(path)
+    signature = f"v{_CACHE_VERSION}|{kind}|{os.path.abspath(path)}|{st.st_mtime_ns}|{st.st_size}"
+    cache_dir = get_config_dir() / 'cache'
+    cache_file = cache_dir / f"{hashlib.blake2b(signature.encode(), digest_size=16).hexdigest()}.json"
+    try:
+        with open(cache_file, 'rb') as f:
+            value = json_utils.loads(f.read())
+    except (OSError, ValueError):
+        pass
+    else:
+        try:
+            os.utime(cache_file)  # Mark as recently used for _prune_cache_dir
+        except OSError:
+            pass
+        return value
+    
+    value = compute(path)
+    # The caller is the Tk event loop: write the cache file in the background
+    threading.Thread(target=_write_cache_file, args=(cache_file, value), daemon=True).start()
+    return value
+
+
+def _write_cache_file(cache_file, value):
+    """Atomically write a JSON cache file (temp file + rename, never a partial file)"""
+    try:
+        cache_file.parent.mkdir(parents=True, exist_ok=True)
+        tmp_file = cache_file.with_suffix(f".{threading.get_ident()}.tmp")
+        with open(tmp_file, 'wb') as f:
+            f.write(json_utils.dumps(value))
+        os.replace(tmp_file, cache_file)
+    except OSError as e:
+        print(f"[DEBUG] Could not write cache file {cache_file}: {e}")
+    _prune_cache_dir(cache_file.parent)
+
+
+def _prune_cache_dir(cache_dir):
+    """Remove the least recently used cache files beyond _CACHE_MAX_FILES"""
+    try:
+        entries = [(entry.stat().st_mtime_ns, entry.path) for entry in os.scandir(cache_dir)
+                   if entry.name.endswith('.json')]
+    except OSError:
+        return
+    entries.sort()
+    for _, path in entries[:-_CACHE_MAX_FILES]:
+        try:
+            os.remove(path)
+        except OSError:
+            pass  # Already removed by another writer thread
+
+
+def _csv_info(path):
+    """Column names and row count of a CSV file"""
+    # The header comes from the start of the file, the rows are counted in one streaming pass
+    columns = read_csv_header(path)
+    rows = count_csv_rows(path) if columns else 0
+    return {'columns': columns, 'rows': rows}
 
 
 class FieldMappingRow:
     """Represents a single field mapping row with multiple columns and priority"""
-    def __init__(self, parent, placeholder, csv_columns, on_change_callback, on_delete_callback=None):
+    def __init__(self, parent, placeholder, csv_columns, on_change_callback, on_delete_callback=None,
+                 combo_values=None):
         self.parent = parent
         self.placeholder = placeholder
         self.csv_columns = csv_columns
+        # Dropdown choices, shared by all rows when given by the caller
+        self.combo_values = combo_values if combo_values is not None else ('',) + tuple(csv_columns)
         self.on_change_callback = on_change_callback
         self.on_delete_callback = on_delete_callback
         self.column_vars = []
+        # Every selector ever created, visible or hidden: removed selectors are hidden
+        # with grid_remove() and shown again on add instead of being rebuilt
+        self.selector_frames = []
+        self.selector_vars = []
         self.combine_var = tk.BooleanVar(value=False)
         
     def create_widgets(self, row_idx):
@@ -98,7 +179,7 @@ class FieldMappingRow:
         # Column combobox
         var = tk.StringVar()
         combo = ttk.Combobox(selector_frame, textvariable=var,
-                           values=[''] + self.csv_columns, state="readonly", width=25)
+                           values=self.combo_values, state="readonly", width=25)
         combo.grid(row=0, column=1, sticky=(tk.W, tk.E), padx=2)
         
         # Bind to selection event with debug output
@@ -115,18 +196,36 @@ class FieldMappingRow:
         
         combo.bind('<<ComboboxSelected>>', on_select)
         
+        self.selector_frames.append(selector_frame)
+        self.selector_vars.append(var)
         self.column_vars.append(var)
         
         # Remove button (only if not the first one)
         if idx > 0:
             remove_btn = ttk.Button(selector_frame, text="-", width=3,
-                                   command=lambda: self.remove_column_selector(idx))
+                                   command=partial(self.remove_column_selector, idx))
             remove_btn.grid(row=0, column=2, padx=2)
     
+    def show_column_selector(self, idx):
+        """Show the selector at position idx, reusing a hidden one if available"""
+        if idx < len(self.selector_frames):
+            self.selector_frames[idx].grid()
+            var = self.selector_vars[idx]
+            var.set('')
+            self.column_vars.append(var)
+        else:
+            self.create_column_selector(idx)
+    
+    def hide_column_selectors(self, count):
+        """Hide every selector beyond the first count"""
+        for frame in self.selector_frames[count:len(self.column_vars)]:
+            frame.grid_remove()
+        del self.column_vars[count:]
+    
     def add_column_selector(self):
         """Add another column selector (up to 5 total)"""
         if len(self.column_vars) < 5:
-            self.create_column_selector(len(self.column_vars))
+            self.show_column_selector(len(self.column_vars))
             self._on_change()
     
     def remove_column_selector(self, idx):
@@ -140,16 +239,10 @@ class FieldMappingRow:
             # Remove the value at index
             current_values.pop(idx)
             
-            # Clear column_vars and widgets
-            self.column_vars.clear()
-            for widget in self.columns_frame.winfo_children():
-                widget.destroy()
-            
-            # Recreate selectors with remaining values
-            for i, value in enumerate(current_values):
-                self.create_column_selector(i)
-                if value:
-                    self.column_vars[i].set(value)
+            # Hide the last selector and shift the remaining values up
+            self.hide_column_selectors(len(current_values))
+            for var, value in zip(self.column_vars, current_values):
+                var.set(value)
             
             print(f"[DEBUG] After remove: {[v.get() for v in self.column_vars]}")
             self._on_change()
@@ -164,21 +257,21 @@ class FieldMappingRow:
     def get_mapping(self):
         """Get the mapping configuration for this field"""
         # Debug: print what we're actually seeing
+        # Read each Tcl variable once
         all_vars = [var.get() for var in self.column_vars]
+        columns = [v for v in all_vars if v]
         combine_checked = self.combine_var.get()
         
         print(f"[DEBUG] get_mapping() for {self.placeholder}:")
         print(f"[DEBUG]   - Total column_vars: {len(self.column_vars)}")
         print(f"[DEBUG]   - All values: {all_vars}")
-        print(f"[DEBUG]   - Non-empty values: {[v for v in all_vars if v]}")
+        print(f"[DEBUG]   - Non-empty values: {columns}")
         print(f"[DEBUG]   - Combine checkbox: {combine_checked} (type: {type(combine_checked)})")
         
-        columns = [var.get() for var in self.column_vars if var.get()]
-        
         # IMPORTANT: Always return a mapping object, even if no columns selected
         # This preserves the number of dropdowns when saving/loading config
         return {
-            'columns': columns if columns else [],
+            'columns': columns,
             'combine': combine_checked,
             'num_dropdowns': len(self.column_vars)  # Save the number of dropdowns
         }
@@ -196,14 +289,15 @@ class FieldMappingRow:
         print(f"[DEBUG]   - Config columns: {columns}")
         print(f"[DEBUG]   - Config num_dropdowns: {num_dropdowns}")
         
-        # Clear existing
-        for widget in self.columns_frame.winfo_children():
-            widget.destroy()
-        self.column_vars.clear()
+        # Reuse existing dropdowns, hide the extra ones
+        self.hide_column_selectors(num_dropdowns)
         
-        # Create the correct number of dropdowns
+        # Set the correct number of dropdowns
         for i in range(num_dropdowns):
-            self.create_column_selector(i)
+            if i < len(self.column_vars):
+                self.column_vars[i].set('')
+            else:
+                self.show_column_selector(i)
             # Set the column value if available
             if i < len(columns) and columns[i]:
                 self.column_vars[i].set(columns[i])
@@ -224,10 +318,18 @@ class EnhancedTemplaterGUI:
         self.csv_path = None
         self.template_path = None
         self.csv_columns = []
+        self.csv_columns_lower = []  # Lowercased csv_columns, for auto-matching
+        self.csv_columns_by_lower = {}  # Lowercased name -> first column with that name
+        self.csv_combo_values = ('',)  # Dropdown choices: empty entry + csv_columns
         self.template_placeholders = []
         self.field_mapping_rows = {}
         self.config_dir = get_config_dir()
         self.csv_row_count = 0  # Track number of rows in CSV
+        self.bulk_loading = False  # Set while several dropped files load: refresh the UI once at the end
+        
+        # Named style for the mapping header labels, configured once
+        style = ttk.Style(self.root)
+        style.configure("Bold.TLabel", font=('TkDefaultFont', 9, 'bold'))
         
         self.create_menu()
         self.create_widgets()
@@ -302,14 +404,22 @@ See the LICENSE file for full details.
     def handle_drop(self, event):
         """Handle file drop events"""
         files = self.root.tk.splitlist(event.data)
-        for file_path in files:
-            file_path = file_path.strip('{}')  # Remove curly braces if present
-            ext = os.path.splitext(file_path)[1].lower()
-            
-            if ext == '.csv':
-                self.load_csv(file_path)
-            elif ext == '.docx':
-                self.load_template(file_path)
+        # Several files dropped at once (e.g. CSV + template): rebuild the mapping UI only once
+        self.bulk_loading = len(files) > 1
+        try:
+            for file_path in files:
+                file_path = file_path.strip('{}')  # Remove curly braces if present
+                lower_path = file_path.lower()
+                
+                if lower_path.endswith('.csv'):
+                    self.load_csv(file_path)
+                elif lower_path.endswith('.docx'):
+                    self.load_template(file_path)
+        finally:
+            if self.bulk_loading:
+                self.bulk_loading = False
+                self.update_mapping_ui()
+                self.check_ready_to_generate()
     
     def create_widgets(self):
         # Main container with padding
@@ -473,10 +583,17 @@ See the LICENSE file for full details.
             self.csv_path = filepath
             self.csv_label.config(text=os.path.basename(filepath), foreground="black")
             
-            # Read CSV to get columns
-            df = read_csv_any(filepath)
-            self.csv_columns = list(df.columns)
-            self.csv_row_count = len(df)
+            # Read only the header for the columns, and a single column for the row count:
+            # the full DataFrame is only needed at generation time. Reloading an unchanged
+            # file is served from the cache.
+            csv_info = cached_file_info(filepath, 'csv', _csv_info)
+            self.csv_columns = csv_info['columns']
+            self.csv_row_count = csv_info['rows']
+            self.csv_combo_values = ('',) + tuple(self.csv_columns)
+            self.csv_columns_lower = [col.lower() for col in self.csv_columns]
+            self.csv_columns_by_lower = {}
+            for col_lower, col in zip(self.csv_columns_lower, self.csv_columns):
+                self.csv_columns_by_lower.setdefault(col_lower, col)
             
             print(f"[DEBUG] CSV loaded successfully:")
             print(f"[DEBUG]   - Total rows: {self.csv_row_count}")
@@ -489,16 +606,17 @@ See the LICENSE file for full details.
             self.csv_info_label.config(text=f"({self.csv_row_count} rows)")
             
             # Update filename field comboboxes
-            self.filename_field1_combo['values'] = [''] + self.csv_columns
-            self.filename_field2_combo['values'] = [''] + self.csv_columns
+            self.filename_field1_combo['values'] = self.csv_combo_values
+            self.filename_field2_combo['values'] = self.csv_combo_values
             # Don't auto-select the first column - let user choose or config load it
             # if self.csv_columns:
             #     self.filename_field1_var.set(self.csv_columns[0])
             #     self.filename_field2_var.set('')  # Second field is optional
             
-            self.update_mapping_ui()
-            # Config save/load removed
-            self.check_ready_to_generate()
+            if not self.bulk_loading:
+                self.update_mapping_ui()
+                # Config save/load removed
+                self.check_ready_to_generate()
         except Exception as e:
             print(f"[DEBUG] Error loading CSV: {e}")
             import traceback
@@ -524,6 +642,7 @@ See the LICENSE file for full details.
             self.template_label.config(text=os.path.basename(filepath), foreground="black")
             
             # Get placeholders from template
+            # (scans are cached in memory by templater_core until the file changes)
             self.template_placeholders = get_placeholders_from_template(filepath)
             
             print(f"[DEBUG] Template loaded successfully:")
@@ -533,9 +652,10 @@ See the LICENSE file for full details.
             # Update template field dropdown for filename configuration
             self.filename_template_combo['values'] = [''] + self.template_placeholders
             
-            self.update_mapping_ui()
-            # Config save/load removed
-            self.check_ready_to_generate()
+            if not self.bulk_loading:
+                self.update_mapping_ui()
+                # Config save/load removed
+                self.check_ready_to_generate()
         except Exception as e:
             print(f"[DEBUG] Error loading template: {e}")
             import traceback
@@ -576,13 +696,13 @@ See the LICENSE file for full details.
         # Create header
         header_frame = ttk.Frame(self.mapping_scrollframe)
         header_frame.grid(row=0, column=0, columnspan=4, sticky=(tk.W, tk.E), pady=5)
-        ttk.Label(header_frame, text="Placeholder", font=('TkDefaultFont', 9, 'bold'), width=15).pack(side=tk.LEFT, padx=5)
-        ttk.Label(header_frame, text="CSV Columns (in priority order)", font=('TkDefaultFont', 9, 'bold')).pack(side=tk.LEFT, padx=5)
+        ttk.Label(header_frame, text="Placeholder", style="Bold.TLabel", width=15).pack(side=tk.LEFT, padx=5)
+        ttk.Label(header_frame, text="CSV Columns (in priority order)", style="Bold.TLabel").pack(side=tk.LEFT, padx=5)
         
         # Create mapping rows
         for idx, placeholder in enumerate(self.template_placeholders, start=1):
             row = FieldMappingRow(self.mapping_scrollframe, placeholder, self.csv_columns, 
-                                 self.on_mapping_change)
+                                 self.on_mapping_change, combo_values=self.csv_combo_values)
             row.create_widgets(idx)
             self.field_mapping_rows[placeholder] = row
             
@@ -599,13 +719,13 @@ See the LICENSE file for full details.
         field_name = placeholder.strip('{}').lower()
         
         # Try exact match
-        for col in self.csv_columns:
-            if col.lower() == field_name:
-                return col
+        exact = self.csv_columns_by_lower.get(field_name)
+        if exact is not None:
+            return exact
         
         # Try partial match
-        for col in self.csv_columns:
-            if field_name in col.lower() or col.lower() in field_name:
+        for col_lower, col in zip(self.csv_columns_lower, self.csv_columns):
+            if field_name in col_lower or col_lower in field_name:
                 return col
         
         return None
@@ -807,10 +927,22 @@ See the LICENSE file for full details.
         thread.start()
     
     def run_generation(self, field_mapping, filename_field, prefix, suffix, make_zip):
+        last_update = 0.0
+        
+        def update_progress(progress, message):
+            self.progress_bar.config(value=progress)
+            self.progress_var.set(message)
+        
         def progress_callback(current, total, message):
+            nonlocal last_update
+            # At most one UI update every 50 ms (the final one always goes through),
+            # so the Tk event loop is not flooded with one callback per document
+            now = time.monotonic()
+            if current != total and now - last_update < 0.05:
+                return
+            last_update = now
             progress = (current / total * 100) if total > 0 else 0
-            self.root.after(0, lambda: self.progress_bar.config(value=progress))
-            self.root.after(0, lambda: self.progress_var.set(message))
+            self.root.after(0, update_progress, progress, message)
         
         try:
             print(f"[DEBUG] Calling generate_documents()...")
@@ -823,7 +955,8 @@ See the LICENSE file for full details.
                 filename_prefix=prefix,
                 filename_suffix=suffix,
                 make_zip=make_zip,
-                progress_callback=progress_callback
+                progress_callback=progress_callback,
+                workers=None  # One render process per CPU
             )
             
             print(f"[DEBUG] Generation complete:")
@@ -5,59 +5,434 @@ Test script for core functionality without GUI
 """
 import sys
 import os
+import traceback
+
+def _make_template(td, *paragraphs, doc=None):
+    """Save a DOCX template (doc, or a new document) with the given paragraphs in td, return its path"""
+    from docx import Document
+    if doc is None:
+        doc = Document()
+    for text in paragraphs:
+        doc.add_paragraph(text)
+    template_file = os.path.join(td, "template.docx")
+    doc.save(template_file)
+    return template_file
+
+def _write_csv(csv_file, header, rows, delimiter=";", encoding="utf-8"):
+    """Write a CSV file with header and rows, return its path"""
+    import csv
+    with open(csv_file, "w", encoding=encoding, newline="") as f:
+        writer = csv.writer(f, delimiter=delimiter, lineterminator="\n")
+        writer.writerow(header)
+        writer.writerows(rows)
+    return csv_file
 
 def test_core_module():
     """Test templater_core module"""
     print("Testing templater_core module...")
-    try:
-        from templater_core import (
-            read_csv_any, 
-            get_placeholders_from_template, 
-            find_columns,
-            generate_documents
-        )
-        print("✓ Core module imported successfully")
-        
-        # Test CSV reading
-        csv_file = "MJ-FAM -Contacts-MAJ-25-AOUT(Donateurs 2022-2023-2024).csv"
-        if os.path.exists(csv_file):
-            df = read_csv_any(csv_file)
-            print(f"✓ CSV reading works ({len(df)} rows)")
+    from templater_core import (
+        read_csv_any, 
+        read_csv_header,
+        get_placeholders_from_template, 
+        find_columns,
+        generate_documents
+    )
+    print("✓ Core module imported successfully")
+    
+    # Test CSV reading
+    csv_file = "MJ-FAM -Contacts-MAJ-25-AOUT(Donateurs 2022-2023-2024).csv"
+    if os.path.exists(csv_file):
+        df = read_csv_any(csv_file)
+        print(f"✓ CSV reading works ({len(df)} rows)")
+        
+        # Header-only read must see the same columns
+        assert read_csv_header(csv_file) == list(df.columns), \
+            "read_csv_header columns differ from read_csv_any"
+        print("✓ CSV header reading works")
+        
+        # Test column detection
+        first, last, org, civ, amt = find_columns(df)
+        print(f"✓ Column detection works (amount col: {amt})")
+    
+    # Test template reading
+    template_file = "DONATION-AMIS-JENISCH.docx"
+    if os.path.exists(template_file):
+        placeholders = get_placeholders_from_template(template_file)
+        print(f"✓ Template reading works ({len(placeholders)} placeholders)")
+        print(f"  Placeholders: {', '.join(placeholders)}")
+
+def test_amount_parsing():
+    """Test amount parsing and the per-row amount lookup"""
+    print("\nTesting amount parsing...")
+    import pandas as pd
+    from templater_core import parse_amount, find_amount_in_row, amount_like_columns
+    
+    values = ["", "100", "55 + 100", "1'000.-", "8000 Zürich 250", "20,50",
+              "1.500,25", "CHF 100.-", "abc", "55\xa0+\xa0100", "1234 5678 + 9"]
+    parsed = [parse_amount(v) for v in values]
+    expected = [0.0, 100.0, 155.0, 0.0, 250.0, 20.5, 25.0, 100.0, 0.0, 155.0, 12345687.0]
+    assert parsed == expected, f"parse_amount mismatch: {parsed} != {expected}"
+    print("✓ parse_amount works")
+    
+    df = pd.DataFrame({"ref": ["2024", "x", ""], "don": ["", "50", ""], "total": ["12", "7", "60000"]})
+    for amount_col, expected in ((None, [12.0, 50.0, 0.0]), ("total", [12.0, 7.0, 60000.0])):
+        amounts = [find_amount_in_row(row, amount_col) for _, row in df.iterrows()]
+        hoisted = [find_amount_in_row(row, amount_col, amount_like_columns(df.columns), list(reversed(df.columns)))
+                   for row in df.to_dict("records")]
+        assert amounts == expected and hoisted == expected, f"find_amount_in_row mismatch: {amounts} / {hoisted} != {expected}"
+    print("✓ find_amount_in_row works with and without precomputed columns")
+
+def test_civility_inference():
+    """Test civility inference from first names"""
+    print("\nTesting civility inference...")
+    from templater_core import infer_civility
+    
+    names = ["Hélène", "jean", "", "Anne et Paul", "Marie-Claire", "Ursula",
+             "Tom", "  Lisa  Ann ", "Nicolas", "Jo & Max", "ÉLISE"]
+    expected = ["Madame", "Monsieur", "Monsieur/Madame", "Monsieur et Madame", "Monsieur", "Madame",
+                "Monsieur", "Madame", "Monsieur", "Monsieur et Madame", "Madame"]
+    inferred = [infer_civility(n) for n in names]
+    assert inferred == expected, f"infer_civility mismatch: {inferred} != {expected}"
+    print("✓ infer_civility works")
+
+def test_display_names():
+    """Test display names built from the name columns of a row"""
+    print("\nTesting display names...")
+    import pandas as pd
+    from templater_core import build_display_name
+    
+    df = pd.DataFrame({
+        "Prénom": ["Hélène", "Anne et Paul", "", "", "Tom", "  ", ""],
+        "Nom": ["Müller", "Martin", "Dupont", "", "", "", ""],
+        "Société": ["", "", "", "Fondation X", "ACME SA", "", ""],
+        "Civilité": ["", "", "Dr", "", "", "", ""],
+        "Nom complet": ["", "", "", "", "", "", "Jean  Durand"],
+    })
+    expected = {
+        ("Prénom", "Nom", "Société", "Civilité"): [
+            "Madame Hélène Müller", "Monsieur et Madame Anne et Paul Martin", "Dr Dupont",
+            "Fondation X", "ACME SA", "Monsieur/Madame", "Monsieur/Madame"],
+        ("Prénom", "Nom", None, None): [
+            "Madame Hélène Müller", "Monsieur et Madame Anne et Paul Martin", "Monsieur/Madame Dupont",
+            "Monsieur/Madame", "Monsieur Tom", "Monsieur/Madame", "Monsieur/Madame"],
+    }
+    for cols, names in expected.items():
+        built = [build_display_name(row, *cols) for row in df.to_dict("records")]
+        assert built == names, f"build_display_name mismatch: {built} != {names}"
+    print("✓ build_display_name works")
+
+def test_csv_partial_read():
+    """Test reading only the first rows / the header of a CSV"""
+    print("\nTesting partial CSV reads...")
+    import tempfile
+    from templater_core import read_csv_any, read_csv_header, count_csv_rows
+    
+    with tempfile.TemporaryDirectory() as td:
+        # ';' goes through the C engine, ':' through the python-engine fallback
+        for sep in (";", ":"):
+            csv_file = _write_csv(os.path.join(td, "data.csv"), ["Prénom", "Nom", "Montant"],
+                                  ([f"Prénom{i}", f"Nom{i}", str(i * 10)] for i in range(20)),
+                                  delimiter=sep, encoding="cp1252")
             
-            # Test column detection
-            first, last, org, civ, amt = find_columns(df)
-            print(f"✓ Column detection works (amount col: {amt})")
+            full = read_csv_any(csv_file)
+            head = read_csv_any(csv_file, nrows=5)
+            assert head.equals(full.head(5)), f"nrows=5 differs from head(5) (sep {sep!r})"
+            assert read_csv_header(csv_file) == list(full.columns), \
+                f"read_csv_header differs from read_csv_any columns (sep {sep!r})"
+            assert count_csv_rows(csv_file) == len(full) == 20, f"count_csv_rows differs from read_csv_any (sep {sep!r})"
         
-        # Test template reading
-        template_file = "DONATION-AMIS-JENISCH.docx"
-        if os.path.exists(template_file):
-            placeholders = get_placeholders_from_template(template_file)
-            print(f"✓ Template reading works ({len(placeholders)} placeholders)")
-            print(f"  Placeholders: {', '.join(placeholders)}")
+        # Past 64 KiB only the start of the file is read for the header: the cut
+        # falls inside a two-byte "é" here, and a header longer than that is read in full
+        for header in ("Prénom;Noms", "Prénom;" + "N" * 70000):
+            csv_file = os.path.join(td, "large.csv")
+            with open(csv_file, "w", encoding="utf-8", newline="") as f:
+                f.write(header + "\n")
+                f.writelines(f"{'é' * 500};{i}\n" for i in range(200))
+            assert read_csv_header(csv_file) == list(read_csv_any(csv_file).columns) == header.split(";"), \
+                "read_csv_header differs from read_csv_any columns on a large file"
         
-        return True
-    except Exception as e:
-        print(f"✗ Core module test failed: {e}")
-        import traceback
-        traceback.print_exc()
-        return False
+        # A cp1252 row after the first 64 KiB makes read_csv_any decode the whole
+        # file as cp1252: the header must be read the same way
+        csv_file = os.path.join(td, "mixed.csv")
+        with open(csv_file, "wb") as f:
+            f.write("Prénom;Nom\n".encode("utf-8"))
+            f.writelines(f"Jean;Nom{i}\n".encode("ascii") for i in range(10000))
+            f.write("Hélène;Müller\n".encode("cp1252"))
+        assert read_csv_header(csv_file) == list(read_csv_any(csv_file).columns) == ["PrÃ©nom", "Nom"], \
+            "read_csv_header decodes a mixed-encoding file differently from read_csv_any"
+    print("✓ Partial CSV reads work")
+
+def test_row_limit():
+    """Test generating documents for the first rows of a CSV only"""
+    print("\nTesting row_limit...")
+    import tempfile
+    from docx import Document
+    from templater_core import generate_documents
+    
+    with tempfile.TemporaryDirectory() as td:
+        template_file = _make_template(td, "Bonjour {NOM}")
+        csv_file = _write_csv(os.path.join(td, "data.csv"), ["Nom", "Montant"],
+                              ([f"Nom{i}", str(i)] for i in range(10)))
+        
+        files, _ = generate_documents(csv_file, template_file, os.path.join(td, "out"),
+                                      {"{NOM}": "Nom"}, row_limit=3)
+        texts = [Document(f).paragraphs[0].text for f in files]
+        assert texts == ["Bonjour Nom0", "Bonjour Nom1", "Bonjour Nom2"], \
+            f"Unexpected documents with row_limit=3: {texts}"
+    print("✓ row_limit works")
+
+def test_text_box_placeholders():
+    """Test that a placeholder split inside a text box keeps the box in place"""
+    print("\nTesting placeholders in text boxes...")
+    import tempfile
+    from docx import Document
+    from docx.oxml import parse_xml
+    from docx.oxml.ns import qn
+    from docx.text.paragraph import Paragraph
+    from templater_core import generate_documents
+    
+    with tempfile.TemporaryDirectory() as td:
+        doc = Document()
+        p = doc.add_paragraph("Voir encadré : ")
+        # VML text box anchored in the paragraph, its placeholder split over two runs
+        p._p.append(parse_xml(
+            '<w:r xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main"'
+            ' xmlns:v="urn:schemas-microsoft-com:vml"><w:pict><v:shape><v:textbox><w:txbxContent>'
+            '<w:p><w:r><w:t>{NO</w:t></w:r><w:r><w:t>M}</w:t></w:r></w:p>'
+            '</w:txbxContent></v:textbox></v:shape></w:pict></w:r>'))
+        template_file = _make_template(td, doc=doc)
+        # A tab forces the python-docx renderer, the other value the raw one
+        csv_file = _write_csv(os.path.join(td, "data.csv"), ["Nom", "Montant"],
+                              [["Dupont & Fils", "1"], ["Dupont\tFils", "2"]])
+        
+        files, _ = generate_documents(csv_file, template_file, os.path.join(td, "out"), {"{NOM}": "Nom"})
+        for path, expected in zip(files, ["Dupont & Fils", "Dupont\tFils"]):
+            body = Document(path).element.body
+            assert len(list(body.iter(qn("w:pict")))) == 1, f"Text box lost in {os.path.basename(path)}"
+            boxed = [Paragraph(p_el, None).text for box in body.iter(qn("w:txbxContent"))
+                     for p_el in box.iter(qn("w:p"))]
+            assert boxed == [expected], f"Unexpected text box content: {boxed}"
+    print("✓ Text box placeholders work")
+
+def test_raw_renderer():
+    """Test that the byte-substitution renderer matches the python-docx one"""
+    print("\nTesting raw renderer...")
+    import io
+    import tempfile
+    from docx import Document
+    from templater_core import (generate_documents, read_csv_any, _load_template,
+                                _render_document, _render_raw)
+    
+    with tempfile.TemporaryDirectory() as td:
+        doc = Document()
+        doc.add_paragraph("Cher {NOM},")
+        p = doc.add_paragraph("Merci pour ")
+        # Placeholder split over two runs
+        p.add_run("{MON").bold = True
+        p.add_run("TANT} CHF.")
+        doc.add_table(rows=1, cols=1).cell(0, 0).text = "Réf. {NOM}"
+        template_file = _make_template(td, doc=doc)
+        # A tab forces the python-docx renderer
+        csv_file = _write_csv(os.path.join(td, "data.csv"), ["Nom", "Montant"],
+                              [["Dupont & Fils", "100"], ["<Martin>", "5 < 10"], ["Durand\tSA", "&amp;"]])
+        
+        def doc_text(docx):
+            d = Document(docx)
+            return [p.text for p in d.paragraphs] + [c.text for t in d.tables for r in t.rows for c in r.cells]
+        
+        with open(template_file, "rb") as f:
+            template_bytes = f.read()
+        field_mapping = {"{NOM}": "Nom", "{MONTANT}": "Montant"}
+        part, pristine, raw = template = _load_template(template_bytes, tuple(field_mapping))
+        assert raw is not None, "Template not eligible for the raw renderer"
+        
+        files, _ = generate_documents(csv_file, template_file, os.path.join(td, "out"), field_mapping)
+        rows = read_csv_any(csv_file).to_dict("records")
+        assert len(files) == len(rows), f"Unexpected documents: {files}"
+        for path, row in zip(files, rows):
+            mapping = {"{NOM}": row["Nom"], "{MONTANT}": row["Montant"]}
+            expected = doc_text(io.BytesIO(_render_document((part, pristine, None), mapping)))
+            assert expected == [f"Cher {row['Nom']},", f"Merci pour {row['Montant']} CHF.", f"Réf. {row['Nom']}"], \
+                f"Unexpected python-docx rendering: {expected}"
+            assert doc_text(path) == expected, f"{os.path.basename(path)}: {doc_text(path)} != {expected}"
+            assert doc_text(io.BytesIO(_render_document(template, mapping))) == expected
+            if "\t" not in row["Nom"]:
+                assert doc_text(io.BytesIO(_render_raw(raw, mapping))) == expected
+    print("✓ Raw renderer matches python-docx")
+
+def test_parallel_workers():
+    """Test that rendering in worker processes gives the same documents"""
+    print("\nTesting parallel rendering...")
+    import tempfile
+    from docx import Document
+    from templater_core import generate_documents
+    
+    with tempfile.TemporaryDirectory() as td:
+        template_file = _make_template(td, "Bonjour {NOM}, merci pour {MONTANT} CHF.")
+        # Repeated names also exercise the duplicate filename numbering
+        csv_file = _write_csv(os.path.join(td, "data.csv"), ["Nom", "Montant"],
+                              ([f"Nom{i % 7}", str(i * 10)] for i in range(20)))
+        
+        results = {}
+        for workers in (1, 2):
+            files, _ = generate_documents(csv_file, template_file, os.path.join(td, f"out{workers}"),
+                                          {"{NOM}": "Nom", "{MONTANT}": "Montant"}, workers=workers)
+            results[workers] = [(os.path.basename(f), Document(f).paragraphs[0].text) for f in files]
+        assert len(results[1]) == 20, f"Unexpected documents: {results[1]}"
+        assert results[2] == results[1], f"workers=2 differs from workers=1: {results[2]} != {results[1]}"
+    print("✓ Parallel rendering works")
+
+def test_zip_only():
+    """Test writing the documents only into the ZIP archive"""
+    print("\nTesting ZIP-only output...")
+    import io
+    import tempfile
+    import zipfile
+    from docx import Document
+    from templater_core import generate_documents
+    
+    with tempfile.TemporaryDirectory() as td:
+        template_file = _make_template(td, "Bonjour {NOM}")
+        csv_file = _write_csv(os.path.join(td, "data.csv"), ["Nom", "Montant"],
+                              [["Dupont", "1"], ["Martin", "2"], ["Dupont", "3"]])
+        
+        outdir = os.path.join(td, "out")
+        files, zip_path = generate_documents(csv_file, template_file, outdir, {"{NOM}": "Nom"},
+                                             make_zip=True, keep_individual_files=False)
+        # Archive names, not paths
+        assert files == ["Dupont.docx", "Martin.docx", "Dupont_1.docx"], f"Unexpected generated_files: {files}"
+        assert os.listdir(outdir) == [os.path.basename(zip_path)], f"Files written outside the ZIP: {os.listdir(outdir)}"
+        with zipfile.ZipFile(zip_path) as zf:
+            assert zf.namelist() == files, f"Unexpected archive content: {zf.namelist()}"
+            texts = [Document(io.BytesIO(zf.read(name))).paragraphs[0].text for name in files]
+        assert texts == ["Bonjour Dupont", "Bonjour Martin", "Bonjour Dupont"], f"Unexpected documents: {texts}"
+    print("✓ ZIP-only output works")
+
+def test_constant_placeholders():
+    """Test that placeholders shared by every row are substituted into the template once"""
+    print("\nTesting constant placeholders...")
+    import tempfile
+    from docx import Document
+    import templater_core
+    
+    with tempfile.TemporaryDirectory() as td:
+        template_file = _make_template(td, "Bonjour {NOM} de {VILLE}{VIDE}, le {DATE}.")
+        # Same city for every row; the date of the last row differs
+        csv_file = _write_csv(os.path.join(td, "data.csv"), ["Nom", "Ville", "Date"],
+                              [[f"Nom{i}", "Lausanne", "1.1.2025" if i < 3 else "2.1.2025"] for i in range(4)])
+        
+        specialized = []
+        specialize_template = templater_core._specialize_template
+        def recording_specialize(template_bytes, constant_mapping):
+            specialized.append(constant_mapping)
+            return specialize_template(template_bytes, constant_mapping)
+        templater_core._specialize_template = recording_specialize
+        try:
+            files, _ = templater_core.generate_documents(
+                csv_file, template_file, os.path.join(td, "out"),
+                {"{NOM}": "Nom", "{VILLE}": "Ville", "{VIDE}": "", "{DATE}": "Date"})
+        finally:
+            templater_core._specialize_template = specialize_template
+        
+        assert specialized == [{"{VILLE}": "Lausanne", "{VIDE}": ""}], f"Unexpected constant placeholders: {specialized}"
+        texts = [Document(f).paragraphs[0].text for f in files]
+        expected = [f"Bonjour Nom{i} de Lausanne, le {'1.1.2025' if i < 3 else '2.1.2025'}." for i in range(4)]
+        assert texts == expected, f"Unexpected documents: {texts}"
+    print("✓ Constant placeholders work")
+
+def test_output_names():
+    """Test duplicate filename numbering and the cleanup of claimed names"""
+    print("\nTesting output file names...")
+    import tempfile
+    from templater_core import generate_documents, _claim_path
+    
+    with tempfile.TemporaryDirectory() as td:
+        claimed = os.path.join(td, "claimed.docx")
+        assert _claim_path(claimed) and not _claim_path(claimed), "_claim_path claimed a name twice"
+        
+        template_file = _make_template(td, "Bonjour {NOM}")
+        csv_file = _write_csv(os.path.join(td, "data.csv"), ["Nom", "Montant"],
+                              [["Dupont", "1"], ["Martin", "2"], ["Dupont", "3"]])
+        
+        # A file left by an earlier run is neither overwritten nor reused
+        outdir = os.path.join(td, "out")
+        os.makedirs(outdir)
+        with open(os.path.join(outdir, "Dupont.docx"), "wb") as f:
+            f.write(b"earlier run")
+        files, _ = generate_documents(csv_file, template_file, outdir, {"{NOM}": "Nom"})
+        names = [os.path.basename(f) for f in files]
+        assert names == ["Dupont_1.docx", "Martin.docx", "Dupont_2.docx"], f"Unexpected file names: {names}"
+        with open(os.path.join(outdir, "Dupont.docx"), "rb") as f:
+            assert f.read() == b"earlier run", "Existing file overwritten"
+        
+        # A template that cannot be rendered leaves no empty claimed files behind
+        corrupt_template = os.path.join(td, "corrupt.docx")
+        with open(corrupt_template, "wb") as f:
+            f.write(b"not a docx")
+        outdir = os.path.join(td, "failed")
+        os.makedirs(outdir)
+        with open(os.path.join(outdir, "Dupont.docx"), "wb") as f:
+            f.write(b"earlier run")
+        try:
+            generate_documents(csv_file, corrupt_template, outdir, {"{NOM}": "Nom"})
+        except Exception:
+            pass
+        else:
+            raise AssertionError("Corrupt template rendered without error")
+        assert os.listdir(outdir) == ["Dupont.docx"], f"Claimed files left behind: {os.listdir(outdir)}"
+        
+        # Neither does a name that cannot be claimed, after others were: 100 CJK
+        # characters are 300 bytes in UTF-8, too long for most file systems
+        with open(csv_file, "a", encoding="utf-8", newline="") as f:
+            f.write("漢" * 100 + ";4\n")
+        outdir = os.path.join(td, "long")
+        try:
+            generate_documents(csv_file, template_file, outdir, {"{NOM}": "Nom"})
+        except OSError:
+            assert os.listdir(outdir) == [], f"Claimed files left behind: {os.listdir(outdir)}"
+    print("✓ Output file names work")
+
+def test_placeholder_cache():
+    """Test that template scans are cached until the file changes"""
+    print("\nTesting placeholder cache...")
+    import io
+    import tempfile
+    from docx import Document
+    from templater_core import get_placeholders_from_template, invalidate_placeholder_cache
+    
+    with tempfile.TemporaryDirectory() as td:
+        doc = Document()
+        template_file = _make_template(td, "Bonjour {NOM}, merci pour {MONTANT} CHF.", doc=doc)
+        
+        first = get_placeholders_from_template(template_file)
+        second = get_placeholders_from_template(template_file)
+        assert first == ["{NOM}", "{MONTANT}"] and second == first and second is not first, \
+            f"Unexpected placeholders: {first} / {second}"
+        
+        # A modified template must be scanned again
+        doc.add_paragraph("Date: {DATE}")
+        doc.save(template_file)
+        updated = get_placeholders_from_template(template_file)
+        assert updated == ["{NOM}", "{MONTANT}", "{DATE}"], f"Modified template not rescanned: {updated}"
+        
+        invalidate_placeholder_cache()
+        assert get_placeholders_from_template(template_file) == updated, \
+            "Scan after invalidate_placeholder_cache() differs"
+    
+    # Templates kept in memory are scanned without touching the disk
+    buf = io.BytesIO()
+    doc.save(buf)
+    assert get_placeholders_from_template(buf.getvalue()) == updated, "In-memory template scan differs"
+    assert get_placeholders_from_template(io.BytesIO(buf.getvalue())) == updated, "In-memory template scan differs"
+    print("✓ Placeholder cache works")
 
 def test_example_script():
     """Test example.py script"""
     print("\nTesting example.py script...")
-    try:
-        import os
-        if os.path.exists('example.py'):
-            print("✓ Example script exists")
-            return True
-        else:
-            print("⚠ Example script not found")
-            return True  # Not a critical failure
-    except Exception as e:
-        print(f"✗ Example script test failed: {e}")
-        import traceback
-        traceback.print_exc()
-        return False
+    if os.path.exists('example.py'):
+        print("✓ Example script exists")
+    else:
+        print("⚠ Example script not found")  # Not a critical failure
 
 def test_gui_module():
     """Test templater_gui_enhanced module (may fail in headless environment)"""
@@ -65,17 +440,19 @@ def test_gui_module():
     try:
         import templater_gui_enhanced
         print("✓ Enhanced GUI module imported successfully")
-        return True
     except ModuleNotFoundError as e:
-        if 'tkinter' in str(e):
-            print("⚠ Enhanced GUI module requires tkinter (not available in this environment)")
-            return True  # Not a failure, just unavailable
-        else:
-            print(f"✗ Enhanced GUI module test failed: {e}")
-            return False
+        if 'tkinter' not in str(e):
+            raise
+        # Not a failure, just unavailable
+        print("⚠ Enhanced GUI module requires tkinter (not available in this environment)")
+
+def run_test(test):
+    """Run one test, report its failure and return whether it passed"""
+    try:
+        test()
+        return True
     except Exception as e:
-        print(f"✗ Enhanced GUI module test failed: {e}")
-        import traceback
+        print(f"✗ {test.__name__} failed: {e}")
         traceback.print_exc()
         return False
 
@@ -85,9 +462,21 @@ def main():
     print("=" * 60)
     
     results = []
-    results.append(("Core Module", test_core_module()))
-    results.append(("Example Script", test_example_script()))
-    results.append(("GUI Module", test_gui_module()))
+    results.append(("Core Module", run_test(test_core_module)))
+    results.append(("Amount Parsing", run_test(test_amount_parsing)))
+    results.append(("Civility Inference", run_test(test_civility_inference)))
+    results.append(("Display Names", run_test(test_display_names)))
+    results.append(("CSV Partial Read", run_test(test_csv_partial_read)))
+    results.append(("Row Limit", run_test(test_row_limit)))
+    results.append(("Text Boxes", run_test(test_text_box_placeholders)))
+    results.append(("Raw Renderer", run_test(test_raw_renderer)))
+    results.append(("Parallel Rendering", run_test(test_parallel_workers)))
+    results.append(("ZIP-only Output", run_test(test_zip_only)))
+    results.append(("Constant Placeholders", run_test(test_constant_placeholders)))
+    results.append(("Output File Names", run_test(test_output_names)))
+    results.append(("Placeholder Cache", run_test(test_placeholder_cache)))
+    results.append(("Example Script", run_test(test_example_script)))
+    results.append(("GUI Module", run_test(test_gui_module)))
     
     print("\n" + "=" * 60)
     print("Test Results Summary")